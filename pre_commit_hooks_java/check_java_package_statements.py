@@ -13,7 +13,11 @@ import pathlib
 import re
 import typing
 
-PACKAGE_STATEMENT_PATTERN = re.compile(r"package\s+(?P<name>\w+\.[\w\.]*\w+)\s*;")
+from pre_commit_hooks_java.comments import find_comment_boundaries, is_inside_comment
+
+PACKAGE_STATEMENT_PATTERN = re.compile(
+    r"^package\s+(?P<name>\w+\.[\w\.]*\w+)\s*;", re.MULTILINE
+)
 
 
 class JavaPackageStatement(typing.NamedTuple):
@@ -33,27 +37,40 @@ def find_java_package_statement(
     path: pathlib.Path,
 ) -> typing.Optional[JavaPackageStatement]:
     logger = logging.getLogger(__name__)
-    inside_comment = False
-    with path.open(mode="r", encoding="utf8") as fp:
-        for lineno, line in enumerate(fp):
-            if "/*" in line:
-                inside_comment = True
-
-            if "*/" in line:
-                inside_comment = False
-
-            if inside_comment:
-                continue
-
-            if match := PACKAGE_STATEMENT_PATTERN.match(line):
-                package_statement = JavaPackageStatement(match, lineno)
-                logger.debug(
-                    "%s:%d: Found package_statement '%s'",
-                    str(path),
-                    lineno,
-                    package_statement.name,
-                )
-                return package_statement
+    text = path.read_bytes().decode("utf8")
+    comment_boundaries = find_comment_boundaries(text)
+    for match in PACKAGE_STATEMENT_PATTERN.finditer(text):
+        if is_inside_comment(comment_boundaries, match.start()):
+            continue
+
+        lineno = text.count("\n", 0, match.start())
+        package_statement = JavaPackageStatement(match, lineno)
+        logger.debug(
+            "%s:%d: Found package_statement '%s'",
+            str(path),
+            lineno,
+            package_statement.name,
+        )
+        return package_statement
+
+    return None
+
+
+def check_file(path: pathlib.Path) -> typing.Optional[str]:
+    package_statement = find_java_package_statement(path)
+    if package_statement is None:
+        return f"{path!s}: File does not have a package statement"
+
+    package_components = tuple(package_statement.components)
+    path_components = path.parent.parts
+    if len(path_components) > len(package_components):
+        path_components = path_components[-len(package_components) :]
+
+    if package_components != path_components:
+        return (
+            f"{path!s}:{package_statement.lineno}: Package should be "
+            f"{'.'.join(path_components)!r} but is {package_statement.name!r}"
+        )
 
     return None
 
@@ -77,22 +94,8 @@ def main(argv=None):
 
     result = 0
     for path in args.file:
-        package_statement = find_java_package_statement(path)
-        if package_statement is None:
-            print(f"{path!s}: File does not have a package statement")
-            result = 1
-            continue
-
-        package_components = tuple(package_statement.components)
-        path_components = path.parent.parts
-        if len(path_components) > len(package_components):
-            path_components = path_components[-len(package_components) :]
-
-        if package_components != path_components:
-            print(
-                f"{path!s}:{package_statement.lineno}: Package should be "
-                f"{'.'.join(path_components)!r} but is {package_statement.name!r}"
-            )
+        if (message := check_file(path)) is not None:
+            print(message)
             result = 1
 
     return result
@@ -0,0 +1,41 @@
+# Copyright (c) 2022 Jan Holthuis <jan.holthuis@ruhr-uni-bochum.de>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+
+import bisect
+import re
+import typing
+
+# Block comment openers are only searched for outside of string literals,
+# character literals and line comments, because those may contain "/*".
+COMMENT_START_PATTERN = re.compile(
+    r'"""(?:\\.|[^\\])*?"""'
+    r'|"(?:\\.|[^"\\\n])*"'
+    r"|'(?:\\.|[^'\\\n])*'"
+    r"|//[^\n]*"
+    r"|(?P<comment>/\*)"
+)
+
+
+def find_comment_boundaries(text: str) -> list[int]:
+    boundaries = []
+    pos = 0
+    while match := COMMENT_START_PATTERN.search(text, pos):
+        if match.group("comment") is None:
+            pos = match.end()
+            continue
+
+        start = match.start()
+        end = text.find("*/", start + 2)
+        end = len(text) if end == -1 else end + 2
+        boundaries.extend((start, end))
+        pos = end
+    return boundaries
+
+
+def is_inside_comment(boundaries: typing.Sequence[int], pos: int) -> bool:
+    return bisect.bisect_right(boundaries, pos) % 2 == 1
@@ -0,0 +1,35 @@
+# Copyright (c) 2022 Jan Holthuis <jan.holthuis@ruhr-uni-bochum.de>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+
+import concurrent.futures
+import functools
+import logging
+import os
+import typing
+
+T = typing.TypeVar("T")
+U = typing.TypeVar("U")
+
+MIN_FILES_PER_WORKER = 8
+
+
+def map_files(
+    function: typing.Callable[[T], U], files: typing.Sequence[T], loglevel: int
+) -> typing.Iterator[U]:
+    max_workers = min(os.cpu_count() or 1, len(files) // MIN_FILES_PER_WORKER)
+    if max_workers < 2:
+        yield from map(function, files)
+        return
+
+    initializer = functools.partial(
+        logging.basicConfig, level=loglevel, format="%(message)s"
+    )
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_workers, initializer=initializer
+    ) as executor:
+        yield from executor.map(function, files, chunksize=MIN_FILES_PER_WORKER)
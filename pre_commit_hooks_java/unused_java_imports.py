@@ -9,15 +9,27 @@
 
 import argparse
 import enum
-import itertools
+import functools
+import io
 import logging
 import pathlib
 import re
 import typing
 
-IMPORT_PATTERN = re.compile(
-    r"import\s+(?P<static>(?:static\s+)?)(?P<name>\w+\.[\w\.]*\w+)\s*;"
+try:
+    import ahocorasick  # pyright: ignore[reportMissingImports]
+except ImportError:
+    ahocorasick = None
+
+from pre_commit_hooks_java.comments import find_comment_boundaries, is_inside_comment
+from pre_commit_hooks_java.parallel import map_files
+
+IMPORT_STATEMENT = (
+    r"import[^\S\n]+(?P<static>(?:static[^\S\n]+)?)"
+    r"(?P<name>\w+\.[\w\.]*\w+)[^\S\n]*;"
 )
+IMPORT_PATTERN = re.compile(rf"^{IMPORT_STATEMENT}", re.MULTILINE)
+FOLLOWING_IMPORT_PATTERN = re.compile(rf"[^\S\n]*{IMPORT_STATEMENT}")
 
 
 class RemovalReason(enum.Enum):
@@ -26,100 +38,200 @@ class RemovalReason(enum.Enum):
 
 
 class JavaImport(typing.NamedTuple):
-    match: re.Match
+    span: tuple[int, int]
+    name: str
+    identifier: str
+    is_static: bool
     lineno: int
     removal_reason: RemovalReason
 
-    @property
-    def name(self) -> str:
-        return self.match.group("name")
+    @classmethod
+    def from_match(
+        cls, match: re.Match, lineno: int, removal_reason: RemovalReason
+    ) -> "JavaImport":
+        name = match.group("name")
+        return cls(
+            span=match.span(),
+            name=name,
+            identifier=name.rpartition(".")[2],
+            is_static=bool(match.group("static")),
+            lineno=lineno,
+            removal_reason=removal_reason,
+        )
+
+
+def identifiers_pattern(identifiers: typing.Iterable[str]) -> re.Pattern:
+    alternatives = "|".join(re.escape(identifier) for identifier in identifiers)
+    return re.compile(rf"\b(?P<identifier>{alternatives})\b")
+
+
+def is_word_character(character: str) -> bool:
+    return character.isalnum() or character == "_"
+
+
+def find_identifiers(
+    text: str, identifiers: typing.Collection[str]
+) -> typing.Iterator[tuple[int, str]]:
+    if not identifiers:
+        return
+
+    if ahocorasick is None:
+        for match in identifiers_pattern(identifiers).finditer(text):
+            yield match.start(), match.group("identifier")
+        return
 
-    @property
-    def is_static(self) -> bool:
-        return bool(self.match.group("static"))
+    automaton = ahocorasick.Automaton()
+    for identifier in identifiers:
+        automaton.add_word(identifier, identifier)
+    automaton.make_automaton()
 
-    @property
-    def identifier(self) -> str:
-        return self.name.rpartition(".")[2]
+    for end, identifier in automaton.iter(text):
+        start = end - len(identifier) + 1
+        if start > 0 and is_word_character(text[start - 1]):
+            continue
+        if end + 1 < len(text) and is_word_character(text[end + 1]):
+            continue
+        yield start, identifier
 
 
-def find_unnecessary_imports(path: pathlib.Path) -> typing.Iterable[JavaImport]:
+def find_import_statements(text: str) -> typing.Iterator[re.Match]:
+    for match in IMPORT_PATTERN.finditer(text):
+        yield match
+        while match := FOLLOWING_IMPORT_PATTERN.match(text, match.end()):
+            yield match
+
+
+def is_inside_import(text: str, pos: int) -> bool:
+    line_start = text.rfind("\n", 0, pos) + 1
+    return (
+        text.startswith("import", line_start)
+        and IMPORT_PATTERN.match(text, line_start) is not None
+    )
+
+
+def find_unnecessary_imports(
+    path: pathlib.Path, text: str
+) -> typing.Iterable[JavaImport]:
     logger = logging.getLogger(__name__)
+    debug = logger.isEnabledFor(logging.DEBUG)
+    path_str = str(path)
     unused_imports: dict[str, JavaImport] = {}
-    inside_comment = False
-    with path.open(mode="r", encoding="utf8") as fp:
-        for lineno, line in enumerate(fp):
-            if "/*" in line:
-                inside_comment = True
-
-            if "*/" in line:
-                inside_comment = False
-
-            if inside_comment:
-                continue
-
-            if match := IMPORT_PATTERN.match(line):
-                java_import = JavaImport(match, lineno, RemovalReason.UNUSED)
-                if (
-                    first_import := unused_imports.get(java_import.identifier)
-                ) is not None:
-                    java_import = JavaImport(match, lineno, RemovalReason.DUPLICATE)
-                    logger.debug(
-                        "%s:%d: Found duplicate import '%s' "
-                        "(already imported in line %d)",
-                        str(path),
-                        lineno,
-                        java_import.name,
-                        first_import.lineno,
-                    )
-                    yield java_import
-                    continue
-
-                unused_imports[java_import.identifier] = java_import
-                if java_import.is_static:
-                    logger.debug(
-                        "%s:%d: Found static import '%s'",
-                        str(path),
-                        lineno,
-                        java_import.name,
-                    )
-                else:
-                    logger.debug(
-                        "%s:%d: Found import '%s'", str(path), lineno, java_import.name
-                    )
-                continue
-
-            for identifier, java_import in unused_imports.copy().items():
-                if re.search(rf"\b{re.escape(identifier)}\b", line):
-                    logger.debug(
-                        "%s:%d: Import '%s' used here",
-                        str(path),
-                        lineno,
-                        java_import.name,
-                    )
-                    del unused_imports[identifier]
-
-        yield from unused_imports.values()
+    comment_boundaries = find_comment_boundaries(text)
+    lineno = 0
+    pos = 0
+    for match in find_import_statements(text):
+        lineno += text.count("\n", pos, match.start())
+        pos = match.start()
+        if is_inside_comment(comment_boundaries, pos):
+            continue
+
+        java_import = JavaImport.from_match(match, lineno, RemovalReason.UNUSED)
+        if (first_import := unused_imports.get(java_import.identifier)) is not None:
+            java_import = java_import._replace(removal_reason=RemovalReason.DUPLICATE)
+            if debug:
+                logger.debug(
+                    "%s:%d: Found duplicate import '%s' (already imported in line %d)",
+                    path_str,
+                    lineno,
+                    java_import.name,
+                    first_import.lineno,
+                )
+            yield java_import
+            continue
+
+        unused_imports[java_import.identifier] = java_import
+        if not debug:
+            continue
+
+        if java_import.is_static:
+            logger.debug(
+                "%s:%d: Found static import '%s'",
+                path_str,
+                lineno,
+                java_import.name,
+            )
+        else:
+            logger.debug("%s:%d: Found import '%s'", path_str, lineno, java_import.name)
+
+    lineno = 0
+    pos = 0
+    for start, identifier in find_identifiers(text, list(unused_imports)):
+        java_import = unused_imports.get(identifier)
+        if java_import is None or start < java_import.span[1]:
+            continue
+
+        if is_inside_comment(comment_boundaries, start) or is_inside_import(
+            text, start
+        ):
+            continue
+
+        del unused_imports[identifier]
+        if debug:
+            lineno += text.count("\n", pos, start)
+            pos = start
+            logger.debug(
+                "%s:%d: Import '%s' used here",
+                path_str,
+                lineno,
+                java_import.name,
+            )
+        if not unused_imports:
+            break
+
+    yield from unused_imports.values()
 
 
 def lines_with_unnecessary_imports_removed(
-    path: pathlib.Path, unnecessary_imports: typing.Iterable[JavaImport]
+    text: str, unnecessary_imports: typing.Iterable[JavaImport]
 ) -> typing.Iterable[str]:
-    imports_by_lines = {
-        k: list(v)
-        for k, v in itertools.groupby(
-            sorted(unnecessary_imports, key=lambda x: x.lineno),
-            key=lambda x: x.lineno,
+    imports_by_lines: dict[int, list[JavaImport]] = {}
+    for java_import in unnecessary_imports:
+        imports_by_lines.setdefault(java_import.lineno, []).append(java_import)
+
+    line_start = 0
+    for lineno, line in enumerate(io.StringIO(text)):
+        line_end = line_start + len(line)
+        imports_in_current_line = imports_by_lines.get(lineno, [])
+        for java_import in sorted(
+            imports_in_current_line, key=lambda x: x.span[0], reverse=True
+        ):
+            start, end = java_import.span
+            line = line[: start - line_start] + line[end - line_start :]
+        line_start = line_end
+        if not imports_in_current_line or line.strip():
+            yield line
+
+
+def check_file(path: pathlib.Path, fix: bool = False) -> tuple[list[str], int]:
+    text = path.read_bytes().decode("utf8")
+    unnecessary_imports = list(find_unnecessary_imports(path, text))
+    messages = []
+    for unnecessary_import in unnecessary_imports:
+        import_type = "static import" if unnecessary_import.is_static else "import"
+        removal_reason = (
+            "Unused"
+            if unnecessary_import.removal_reason == RemovalReason.UNUSED
+            else "Duplicate"
+        )
+        messages.append(
+            "%s:%d: %s %s '%s'"
+            % (
+                str(path),
+                unnecessary_import.lineno,
+                removal_reason,
+                import_type,
+                unnecessary_import.name,
+            )
         )
-    }
 
-    with path.open(mode="r", encoding="utf8") as fp:
-        for lineno, line in enumerate(fp):
-            imports_in_current_line = imports_by_lines.get(lineno, [])
-            for java_import in imports_in_current_line:
-                line = line.replace(java_import.match.group(0), "")
-            if not imports_in_current_line or line.strip():
-                yield line
+    if not unnecessary_imports or not fix:
+        return messages, 0
+
+    new_text = "".join(
+        lines_with_unnecessary_imports_removed(text, unnecessary_imports)
+    )
+    path.write_bytes(new_text.encode("utf8"))
+    return messages, len(unnecessary_imports)
 
 
 def main(argv=None):
@@ -141,36 +253,18 @@ def main(argv=None):
     logging.basicConfig(level=args.loglevel, format="%(message)s")
 
     logger = logging.getLogger(__name__)
-    for path in args.file:
-        unnecessary_imports = list(find_unnecessary_imports(path))
-        for unnecessary_import in unnecessary_imports:
-            import_type = "static import" if unnecessary_import.is_static else "import"
-            removal_reason = (
-                "Unused"
-                if unnecessary_import.removal_reason == RemovalReason.UNUSED
-                else "Duplicate"
-            )
-            print(
-                "%s:%d: %s %s '%s'"
-                % (
-                    str(path),
-                    unnecessary_import.lineno,
-                    removal_reason,
-                    import_type,
-                    unnecessary_import.name,
-                )
-            )
+    results = map_files(
+        functools.partial(check_file, fix=args.fix), args.file, args.loglevel
+    )
+    for path, (messages, removed_imports) in zip(args.file, results):
+        for message in messages:
+            print(message)
 
-        if unnecessary_imports and args.fix:
-            new_lines = list(
-                lines_with_unnecessary_imports_removed(path, unnecessary_imports)
-            )
-            with path.open(mode="w+", encoding="utf8") as fp:
-                fp.writelines(new_lines)
+        if removed_imports:
             logger.info(
                 "%s: Wrote file with %d unnecessary imports removed",
                 str(path),
-                len(unnecessary_imports),
+                removed_imports,
             )
 
     return 0
@@ -0,0 +1,47 @@
+# Copyright (c) 2022 Jan Holthuis <jan.holthuis@ruhr-uni-bochum.de>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+
+import pytest
+
+from pre_commit_hooks_java.check_java_package_statements import (
+    find_java_package_statement,
+)
+
+
+@pytest.mark.parametrize(
+    "header",
+    [
+        "// see src/*.java\n",
+        '// "**/*.java" files\n',
+        "/* license */ // see src/*.java\n",
+    ],
+)
+def test_comment_opener_in_line_comment_is_ignored(tmp_path, header):
+    path = tmp_path / "T.java"
+    path.write_text(f"{header}package a.b;\nclass T {{ }}\n")
+    package_statement = find_java_package_statement(path)
+    assert package_statement is not None
+    assert package_statement.name == "a.b"
+    assert package_statement.lineno == 1
+
+
+def test_package_statement_inside_comment_is_ignored(tmp_path):
+    path = tmp_path / "T.java"
+    path.write_text("/*\npackage x.y;\n*/\npackage a.b;\nclass T { }\n")
+    package_statement = find_java_package_statement(path)
+    assert package_statement is not None
+    assert package_statement.name == "a.b"
+    assert package_statement.lineno == 3
+
+
+def test_package_statement_after_comment_on_same_line(tmp_path):
+    path = tmp_path / "T.java"
+    path.write_text("/* a */ /* b */\npackage a.b;\n")
+    package_statement = find_java_package_statement(path)
+    assert package_statement is not None
+    assert package_statement.lineno == 1
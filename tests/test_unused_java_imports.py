@@ -0,0 +1,181 @@
+# Copyright (c) 2022 Jan Holthuis <jan.holthuis@ruhr-uni-bochum.de>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+
+import pathlib
+
+import pytest
+
+from pre_commit_hooks_java import unused_java_imports
+from pre_commit_hooks_java.unused_java_imports import (
+    RemovalReason,
+    find_identifiers,
+    find_unnecessary_imports,
+    lines_with_unnecessary_imports_removed,
+)
+
+
+@pytest.fixture(autouse=True, params=["regex", "ahocorasick"])
+def identifier_backend(request, monkeypatch):
+    if request.param == "regex":
+        monkeypatch.setattr(unused_java_imports, "ahocorasick", None)
+    else:
+        ahocorasick = pytest.importorskip("ahocorasick")
+        monkeypatch.setattr(unused_java_imports, "ahocorasick", ahocorasick)
+    return request.param
+
+
+def unnecessary_imports(text: str) -> list[tuple[str, RemovalReason]]:
+    return [
+        (java_import.name, java_import.removal_reason)
+        for java_import in find_unnecessary_imports(pathlib.Path("T.java"), text)
+    ]
+
+
+def test_usage_before_import_is_ignored():
+    text = (
+        "// Generated from Map.proto\n"
+        "package a.b;\n"
+        "import java.util.Map;\n"
+        "class T { }\n"
+    )
+    assert unnecessary_imports(text) == [("java.util.Map", RemovalReason.UNUSED)]
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        'PathMatcher m = fs.getPathMatcher("glob:**/*.java");',
+        'String s = "/*";',
+        "// see src/*.java",
+        'char c = \'"\'; String s = "\\"/*";',
+    ],
+)
+def test_comment_opener_outside_of_code_is_ignored(line):
+    text = (
+        "package a.b;\n"
+        "import java.util.List;\n"
+        "class T {\n"
+        f"    {line}\n"
+        "    List<String> names;\n"
+        "}\n"
+    )
+    assert unnecessary_imports(text) == []
+
+
+def test_comment_opened_and_closed_on_same_line():
+    text = (
+        "package a.b;\n"
+        "import x.Foo;\n"
+        "import x.Bar;\n"
+        "class T { /* Bar */ Foo foo; }\n"
+    )
+    assert unnecessary_imports(text) == [("x.Bar", RemovalReason.UNUSED)]
+
+
+def test_code_before_comment_on_same_line():
+    text = (
+        "package a.b;\n"
+        "import x.Foo;\n"
+        "import x.Bar;\n"
+        "class T { Foo foo; /* start of comment\n"
+        "    Bar bar; */\n"
+        "}\n"
+    )
+    assert unnecessary_imports(text) == [("x.Bar", RemovalReason.UNUSED)]
+
+
+def test_import_inside_comment_is_ignored():
+    text = "package a.b;\n/*\nimport x.Foo;\n*/\nclass T { }\n"
+    assert unnecessary_imports(text) == []
+
+
+def test_javadoc_reference_is_not_a_usage():
+    text = "package a.b;\nimport java.util.Map;\n/** {@link Map} */\nclass T { }\n"
+    assert unnecessary_imports(text) == [("java.util.Map", RemovalReason.UNUSED)]
+
+
+def test_imports_on_same_line():
+    text = (
+        "package a.b;\nimport x.Foo;import x.Foo; import x.Bar;\nclass T { Bar b; }\n"
+    )
+    assert unnecessary_imports(text) == [
+        ("x.Foo", RemovalReason.DUPLICATE),
+        ("x.Foo", RemovalReason.UNUSED),
+    ]
+
+
+def test_fix_removes_all_imports_on_same_line():
+    text = "package a.b;\nimport x.Foo;import x.Foo;\nclass T { }\n"
+    new_text = "".join(
+        lines_with_unnecessary_imports_removed(
+            text, find_unnecessary_imports(pathlib.Path("T.java"), text)
+        )
+    )
+    assert new_text == "package a.b;\nclass T { }\n"
+
+
+def test_fix_keeps_used_import_on_same_line():
+    text = "package a.b;\nimport x.Foo; import x.Bar;\nclass T { Bar b; }\n"
+    new_text = "".join(
+        lines_with_unnecessary_imports_removed(
+            text, find_unnecessary_imports(pathlib.Path("T.java"), text)
+        )
+    )
+    assert new_text == "package a.b;\n import x.Bar;\nclass T { Bar b; }\n"
+
+
+@pytest.mark.parametrize(
+    "usage, is_used",
+    [
+        ("Map m;", True),
+        ("HashMap m;", False),
+        ("_Map m;", False),
+        ("Map_ m;", False),
+        ("Map1 m;", False),
+        ("java.util.Map m;", True),
+        ("Map<String, Map<String, String>> m;", True),
+    ],
+)
+def test_identifier_word_boundaries(usage, is_used):
+    text = f"package a.b;\nimport java.util.Map;\nclass T {{ {usage} }}\n"
+    expected = [] if is_used else [("java.util.Map", RemovalReason.UNUSED)]
+    assert unnecessary_imports(text) == expected
+
+
+@pytest.mark.parametrize(
+    "usage, is_used",
+    [
+        ("Ärger ä;", True),
+        ("xÄrger ä;", False),
+        ("Ärgerlich ä;", False),
+        ("𝔘Ärger ä;", False),
+    ],
+)
+def test_non_ascii_identifiers(usage, is_used):
+    text = f"package a.b;\nimport x.Ärger;\nclass T {{ {usage} }}\n"
+    expected = [] if is_used else [("x.Ärger", RemovalReason.UNUSED)]
+    assert unnecessary_imports(text) == expected
+
+
+def test_identifier_offsets_after_non_bmp_characters():
+    text = "😀😀 Map 𝔘 HashMap Map"
+    assert list(find_identifiers(text, ["Map", "HashMap"])) == [
+        (3, "Map"),
+        (9, "HashMap"),
+        (17, "Map"),
+    ]
+
+
+def test_usage_after_non_bmp_characters():
+    text = (
+        "package a.b;\n"
+        "import java.util.Map;\n"
+        "/* 😀😀😀 */\n"
+        'class T { String s = "😀"; Map m; }\n'
+    )
+    assert unnecessary_imports(text) == []